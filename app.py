@@ -3,7 +3,9 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from routers.v1.api import router as v1_router
+import simplelogin
+from routers.v1.api import router as v1_router, smtp_manager
+from smtp_manager import smtp_executor
 from logutils import get_logger
 from utils import get_env_var
 
@@ -16,6 +18,18 @@ redoc_url = None if environment == "production" else "/redoc"
 app = FastAPI(docs_url=docs_url, redoc_url=redoc_url)
 
 
+@app.on_event("startup")
+def prewarm_templates():
+    smtp_manager.prewarm_templates()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    smtp_executor.shutdown(wait=True)
+    smtp_manager.close_all()
+    await simplelogin.aclose()
+
+
 @app.exception_handler(HTTPException)
 def http_exception_handler(_, exc: HTTPException):
     logger.error(exc.detail)
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import hmac
+from hashlib import blake2b
 
 from logutils import get_logger
 from utils import get_env_var
@@ -8,6 +9,12 @@ from utils import get_env_var
 logger = get_logger(__name__)
 
 API_KEY = get_env_var("API_KEY", strict=True)
+_API_KEY_BYTES = API_KEY.encode("ascii")
+
+# Digests of keys that already passed compare_digest; lets repeated calls
+# with the same valid key short-circuit without storing the key itself.
+_VERIFIED_DIGESTS: set = set()
+_VERIFIED_MAXSIZE = 4
 
 
 def authenticate_api_key(api_key: str) -> bool:
@@ -20,4 +27,18 @@ def authenticate_api_key(api_key: str) -> bool:
     Return:
         bool: True if valid, False otherwise.
     """
-    return hmac.compare_digest(api_key, API_KEY)
+    try:
+        api_key_bytes = api_key.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+
+    digest = blake2b(api_key_bytes, digest_size=16).digest()
+    if digest in _VERIFIED_DIGESTS:
+        return True
+
+    if hmac.compare_digest(api_key_bytes, _API_KEY_BYTES):
+        if len(_VERIFIED_DIGESTS) >= _VERIFIED_MAXSIZE:
+            _VERIFIED_DIGESTS.clear()
+        _VERIFIED_DIGESTS.add(digest)
+        return True
+    return False
@@ -1,13 +1,15 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi import APIRouter, HTTPException, Depends, Security
+from fastapi.security import APIKeyHeader
 from auth import authenticate_api_key
 from logutils import get_logger
 from schemas.v1.models import SendEmailRequest, SendEmailResponse
 from simplelogin import SimpleLoginClient
-from smtp_manager import SMTPManager
+from smtp_manager import SMTPManager, smtp_executor
 from utils import obfuscate_email
 
 logger = get_logger(__name__)
@@ -15,17 +17,20 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 smtp_manager = SMTPManager()
+simplelogin_client = SimpleLoginClient(smtp_manager=smtp_manager)
 
+api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
-def verify_api_key(authorization: Optional[str] = Header(None)):
+
+def verify_api_key(authorization: Optional[str] = Security(api_key_header)):
     """Dependency to verify API key from Authorization header."""
     if not authorization:
         logger.warning("Missing Authorization header")
         raise HTTPException(status_code=401, detail="Missing Authorization header")
 
-    api_key = authorization
-    if authorization.startswith("Bearer "):
-        api_key = authorization[7:]
+    # removeprefix is a no-op when the prefix is absent, so the verification
+    # path stays identical regardless of header shape.
+    api_key = authorization.removeprefix("Bearer ")
 
     if not authenticate_api_key(api_key):
         logger.warning("Invalid API key provided")
@@ -35,7 +40,7 @@ def verify_api_key(authorization: Optional[str] = Header(None)):
 
 
 @router.post("/send", response_model=SendEmailResponse)
-def send_email(request: SendEmailRequest, _: str = Depends(verify_api_key)):
+async def send_email(request: SendEmailRequest, _: str = Depends(verify_api_key)):
     """Send a single email."""
 
     substitutions = request.substitutions or {}
@@ -50,8 +55,6 @@ def send_email(request: SendEmailRequest, _: str = Depends(verify_api_key)):
             "Using SimpleLogin with mailbox: %s", obfuscate_email(request.alias.mailbox)
         )
 
-        client = SimpleLoginClient(smtp_manager=smtp_manager)
-
         if request.template:
             is_valid, error_msg = smtp_manager.validate_template_variables(
                 request.template, substitutions
@@ -62,7 +65,7 @@ def send_email(request: SendEmailRequest, _: str = Depends(verify_api_key)):
                 )
                 return SendEmailResponse(success=False, message=error_msg)
 
-        success, message = client.send_via_alias(
+        success, message = await simplelogin_client.send_via_alias(
             mailbox=request.alias.mailbox,
             from_email=request.from_email,
             to_email=request.to_email,
@@ -114,15 +117,18 @@ def send_email(request: SendEmailRequest, _: str = Depends(verify_api_key)):
         sender_name = f"{project_name} Team" if project_name else request.from_name
 
         try:
-            smtp_manager.send_email(
-                from_email=request.from_email,
-                to_email=request.to_email,
-                subject=subject,
-                body=body,
-                sender_name=sender_name,
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                smtp_executor,
+                smtp_manager.send_email,
+                request.from_email,
+                request.to_email,
+                subject,
+                body,
+                sender_name,
             )
             success = True
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
             message = f"Email sent successfully at {timestamp}"
             logger.info(
                 "Email sent via plain SMTP from %s to %s at %s",
@@ -1,25 +1,29 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict
 
 
 class AliasConfig(BaseModel):
     """Configuration for SimpleLogin alias."""
 
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
     mailbox: str
 
 
 class SendEmailRequest(BaseModel):
     """Request model for sending emails."""
 
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
     from_email: str
     to_email: str
     subject: str
     body: Optional[str] = None
     from_name: Optional[str] = None
     template: Optional[str] = None
-    substitutions: Optional[dict] = None
+    substitutions: Optional[Dict[str, Any]] = None
     alias: Optional[AliasConfig] = None
 
 
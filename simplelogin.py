@@ -5,19 +5,105 @@ The API endpoints referenced are from the official SimpleLogin API documentation
 https://github.com/simple-login/app/blob/master/docs/api.md
 """
 
+import asyncio
+import logging
 import smtplib
-from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Dict, List, Optional, Tuple, Any, Set
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Any
+
+import httpx
+from functools import partial
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-import requests
 from logutils import get_logger
 from utils import get_env_var, obfuscate_email
-from smtp_manager import SMTPManager
+from smtp_manager import SMTPManager, smtp_executor
 
 logger = get_logger(__name__)
 
+_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(10, connect=3.05),
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    transport=httpx.AsyncHTTPTransport(retries=3),
+)
+
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.3
+# Upper bound on any single retry pause, including server-provided
+# Retry-After values; beyond this we'd be pinning the request coroutine
+# rather than shedding tail latency.
+_RETRY_MAX_DELAY = 10
+
+
+async def aclose():
+    """Close the shared HTTP client and release pooled connections."""
+    await _client.aclose()
+
+
+_CACHE_MAXSIZE = 128
+_OPTIONS_TTL = 300
+_MAILBOX_TTL = int(get_env_var("SL_MAILBOX_TTL", "300"))
+_SUFFIX_TTL = int(get_env_var("SL_SUFFIX_TTL", "60"))
+_ALIAS_TTL = 600
+_ALIAS_CACHE_MAXSIZE = 1024
+_CONTACT_TTL = 3600
+_CONTACT_CACHE_MAXSIZE = 10_000
+
+_options_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+_mailbox_cache: Dict[Tuple, Tuple[float, List[Dict]]] = {}
+_suffix_cache: Dict[Tuple, Tuple[float, str]] = {}
+_alias_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+_contact_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+
+
+def _cache_get(cache: Dict, key: Tuple, ttl: float) -> Optional[Any]:
+    """Return a cached value if present and not older than ttl seconds."""
+    entry = cache.get(key)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def _cache_put(
+    cache: Dict, key: Tuple, value: Any, maxsize: int = _CACHE_MAXSIZE
+) -> None:
+    """Store a value with its timestamp, clearing the cache if it grew too big."""
+    if len(cache) >= maxsize:
+        cache.clear()
+    cache[key] = (time.monotonic(), value)
+
+
+def _log_send_result(mailbox: str, to_email: str, future) -> None:
+    """Report the outcome of a background SMTP send."""
+    error = future.exception()
+    if error:
+        logger.error(
+            "Background SMTP send from %s to %s failed: %s",
+            obfuscate_email(mailbox),
+            obfuscate_email(to_email),
+            error,
+        )
+
+
+def invalidate_mailboxes() -> None:
+    """Drop cached mailbox lists so the next lookup refetches them."""
+    _mailbox_cache.clear()
+
+
+def _invalidate_caches() -> None:
+    """Drop all cached lookups, e.g. after an upstream client error."""
+    _options_cache.clear()
+    _mailbox_cache.clear()
+    _suffix_cache.clear()
+    _alias_cache.clear()
+    _contact_cache.clear()
+
 
 class SimpleLoginClient:
     """Client for interacting with SimpleLogin API to manage email aliases."""
@@ -29,23 +115,41 @@ class SimpleLoginClient:
         )
         self.api_key = get_env_var("SIMPLELOGIN_API_KEY", strict=False)
         self.smtp_manager = smtp_manager
+        self._client = _client
+        if self.api_key:
+            self._client.headers["Authentication"] = self.api_key
 
-    def _get_headers(self, include_content_type: bool = True) -> Dict[str, str]:
-        """Generate API request headers with authentication."""
-        headers = {"Authentication": self.api_key}
-        if include_content_type:
-            headers["Content-Type"] = "application/json"
-        return headers
-
-    def _make_request(self, method: str, url: str, **kwargs) -> Optional[Dict]:
+    async def _make_request(self, method: str, url: str, **kwargs) -> Optional[Dict]:
         """Make HTTP request with error handling and JSON response parsing."""
         try:
-            response = requests.request(method, url, timeout=30, **kwargs)
-            response.raise_for_status()
-            return response.json() if response.content else {}
-        except requests.exceptions.RequestException as e:
+            for attempt in range(_RETRY_TOTAL + 1):
+                response = await self._client.request(method, url, **kwargs)
+                if response.status_code in _RETRY_STATUS and attempt < _RETRY_TOTAL:
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after:
+                        logger.warning(
+                            "Got %d with Retry-After=%s, backing off",
+                            response.status_code,
+                            retry_after,
+                        )
+                    delay = (
+                        float(retry_after)
+                        if retry_after and retry_after.isdigit()
+                        else _RETRY_BACKOFF * (2**attempt)
+                    )
+                    await asyncio.sleep(min(delay, _RETRY_MAX_DELAY))
+                    continue
+                response.raise_for_status()
+                if not response.content:
+                    return {}
+                if orjson is not None:
+                    return orjson.loads(response.content)
+                return response.json()
+        except httpx.HTTPError as e:
             error_msg = str(e)
-            if hasattr(e, "response") and e.response:
+            if isinstance(e, httpx.HTTPStatusError):
+                if 400 <= e.response.status_code < 500:
+                    _invalidate_caches()
                 try:
                     error_data = e.response.json()
                     error_msg = error_data.get("error", error_msg)
@@ -54,65 +158,105 @@ class SimpleLoginClient:
             logger.error("Request failed: %s", error_msg)
             return None
 
-    def get_alias_options(self, hostname: Optional[str] = None) -> Optional[Dict]:
+    async def get_alias_options(self, hostname: Optional[str] = None) -> Optional[Dict]:
         """Get alias creation options including signed suffixes for domain."""
+        cache_key = (self.api_key, hostname)
+        cached = _cache_get(_options_cache, cache_key, _OPTIONS_TTL)
+        if cached is not None:
+            return cached
+
         url = f"{self.api_base_url}/v5/alias/options"
         if hostname:
             url += f"?hostname={hostname}"
-        response = self._make_request("GET", url, headers=self._get_headers(False))
+        response = await self._make_request("GET", url)
         if response:
             logger.info("Retrieved alias options")
+            _cache_put(_options_cache, cache_key, response)
         return response
 
-    def get_signed_suffix(self, domain: str) -> Optional[str]:
+    async def get_signed_suffix(self, domain: str) -> Optional[str]:
         """Get cryptographically signed suffix for domain from SimpleLogin API."""
-        options = self.get_alias_options(hostname=domain)
+        cache_key = (self.api_key, domain)
+        cached = _cache_get(_suffix_cache, cache_key, _SUFFIX_TTL)
+        if cached is not None:
+            return cached
+
+        options = await self.get_alias_options(hostname=domain)
         if not options or "suffixes" not in options:
             return None
 
-        for suffix_data in options["suffixes"]:
-            if suffix_data["suffix"] == f"@{domain}":
-                return suffix_data["signed_suffix"]
+        suffixes_by_domain = {
+            s["suffix"]: s["signed_suffix"] for s in options["suffixes"]
+        }
+        signed_suffix = suffixes_by_domain.get(f"@{domain}")
+        if signed_suffix:
+            _cache_put(_suffix_cache, cache_key, signed_suffix)
+            return signed_suffix
 
         logger.error("No signed suffix found for domain: %s", domain)
         return None
 
-    def list_aliases(self, query: Optional[str] = None) -> Optional[List[Dict]]:
+    async def list_aliases(self, query: Optional[str] = None) -> Optional[List[Dict]]:
         """Fetch user's aliases, optionally filtered by query string."""
         url = f"{self.api_base_url}/v2/aliases?enabled&page_id=0"
         data = {"query": query} if query else {}
-        response = self._make_request(
-            "POST", url, json=data, headers=self._get_headers()
-        )
+        response = await self._make_request("POST", url, json=data)
         return response["aliases"] if response else None
 
-    def get_or_create_alias(
+    async def get_or_create_alias(
         self, prefix: str, domain: str, mailbox_email: str
-    ) -> Optional[str]:
-        """Get existing alias or create new one with prefix@domain format."""
+    ) -> Optional[Dict]:
+        """Get existing alias or create new one with prefix@domain format.
+
+        Returns:
+            The alias dict (including "email" and "id"), or None on failure.
+        """
         alias_email = f"{prefix}@{domain}"
-        aliases = self.list_aliases(query=alias_email)
-        if aliases:
-            existing_alias = next(
-                (a for a in aliases if a["email"] == alias_email), None
-            )
-            if existing_alias:
-                logger.info("Using existing alias: %s", obfuscate_email(alias_email))
-                return alias_email
-        return self.create_alias(prefix, domain, mailbox_email)
+        # The alias lookup, mailbox lookup, and signed suffix are all
+        # independent; fetch them concurrently and hand the prefetched
+        # values to create_alias if the alias doesn't exist yet.
+        existing_alias, mailbox, signed_suffix = await asyncio.gather(
+            self.get_alias_by_email(alias_email),
+            self.get_mailbox_by_email(mailbox_email),
+            self.get_signed_suffix(domain),
+        )
+        if existing_alias:
+            logger.info("Using existing alias: %s", obfuscate_email(alias_email))
+            return existing_alias
+        return await self.create_alias(
+            prefix, domain, mailbox_email, mailbox=mailbox, signed_suffix=signed_suffix
+        )
 
-    def create_alias(
-        self, prefix: str, domain: str, mailbox_email: str
-    ) -> Optional[str]:
-        """Create new email alias using signed suffix and mailbox ID."""
+    async def create_alias(
+        self,
+        prefix: str,
+        domain: str,
+        mailbox_email: str,
+        mailbox: Optional[Dict] = None,
+        signed_suffix: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Create new email alias using signed suffix and mailbox ID.
+
+        Args:
+            mailbox: Prefetched mailbox dict, looked up if not given.
+            signed_suffix: Prefetched signed suffix, looked up if not given.
+
+        Returns:
+            The created alias dict (including "email" and "id"), or None.
+        """
         url = f"{self.api_base_url}/v3/alias/custom/new"
 
-        mailbox = self.get_mailbox_by_email(mailbox_email)
+        if mailbox is None or signed_suffix is None:
+            # The mailbox and signed-suffix lookups are independent, so
+            # issue them concurrently.
+            mailbox, signed_suffix = await asyncio.gather(
+                self.get_mailbox_by_email(mailbox_email),
+                self.get_signed_suffix(domain),
+            )
         if not mailbox:
             logger.error("Mailbox not found: %s", obfuscate_email(mailbox_email))
             return None
 
-        signed_suffix = self.get_signed_suffix(domain)
         if not signed_suffix:
             logger.error("No signed suffix available for domain: %s", domain)
             return None
@@ -121,13 +265,14 @@ class SimpleLoginClient:
             "alias_prefix": prefix,
             "signed_suffix": signed_suffix,
             "mailbox_ids": [mailbox["id"]],
-            "note": f"Created by RelaySMS Email Service on {datetime.now().isoformat()}",
+            "note": (
+                "Created by RelaySMS Email Service on "
+                f"{datetime.now(timezone.utc).isoformat(timespec='seconds')}"
+            ),
             "name": "RelaySMS Team",
         }
 
-        response = self._make_request(
-            "POST", url, json=data, headers=self._get_headers()
-        )
+        response = await self._make_request("POST", url, json=data)
 
         if not response:
             return None
@@ -135,29 +280,38 @@ class SimpleLoginClient:
         logger.info(
             "Alias created successfully: %s", obfuscate_email(response.get("email"))
         )
-        return response.get("email")
+        # Seed the alias cache so follow-up sends resolve the fresh alias
+        # without a list_aliases round-trip.
+        if response.get("email"):
+            _cache_put(
+                _alias_cache,
+                (self.api_key, response["email"]),
+                response,
+                _ALIAS_CACHE_MAXSIZE,
+            )
+        return response
 
-    def get_alias_by_email(self, alias_email: str) -> Optional[Dict]:
+    async def get_alias_by_email(self, alias_email: str) -> Optional[Dict]:
         """Find alias details by email address."""
-        aliases = self.list_aliases(query=alias_email)
+        cache_key = (self.api_key, alias_email)
+        cached = _cache_get(_alias_cache, cache_key, _ALIAS_TTL)
+        if cached is not None:
+            return cached
+
+        aliases = await self.list_aliases(query=alias_email)
         if not aliases:
             return None
         alias = next((a for a in aliases if a["email"] == alias_email), None)
         if alias:
             logger.info("Found alias: %s", obfuscate_email(alias_email))
+            _cache_put(_alias_cache, cache_key, alias, _ALIAS_CACHE_MAXSIZE)
         return alias
 
-    def add_contact_to_alias(
-        self, alias_email: str, recipient_email: str
+    async def add_contact_to_alias(
+        self, alias: Dict, recipient_email: str
     ) -> Optional[Dict]:
         """Add recipient as contact to alias and return contact with reverse alias."""
-        alias = self.get_alias_by_email(alias_email)
-        if not alias:
-            logger.error("Alias not found: %s", obfuscate_email(alias_email))
-            return None
-
-        alias_id = alias["id"]
-        contact = self.create_contact(alias_id, recipient_email)
+        contact = await self.create_contact(alias["id"], recipient_email)
         if not contact:
             logger.error(
                 "Failed to create contact for %s", obfuscate_email(recipient_email)
@@ -166,15 +320,23 @@ class SimpleLoginClient:
 
         return contact
 
-    def list_mailboxes(self) -> Optional[List[Dict]]:
+    async def list_mailboxes(self) -> Optional[List[Dict]]:
         """Get all available mailboxes for the authenticated user."""
+        cache_key = (self.api_key,)
+        cached = _cache_get(_mailbox_cache, cache_key, _MAILBOX_TTL)
+        if cached is not None:
+            return cached
+
         url = f"{self.api_base_url}/mailboxes"
-        response = self._make_request("GET", url, headers=self._get_headers(False))
-        return response["mailboxes"] if response else None
+        response = await self._make_request("GET", url)
+        if not response:
+            return None
+        _cache_put(_mailbox_cache, cache_key, response["mailboxes"])
+        return response["mailboxes"]
 
-    def get_mailbox_by_email(self, email: str) -> Optional[Dict]:
+    async def get_mailbox_by_email(self, email: str) -> Optional[Dict]:
         """Find mailbox details by email address."""
-        mailboxes = self.list_mailboxes()
+        mailboxes = await self.list_mailboxes()
         if not mailboxes:
             return None
         mailbox = next((mb for mb in mailboxes if mb.get("email") == email), None)
@@ -182,19 +344,28 @@ class SimpleLoginClient:
             logger.info("Found mailbox for: %s", obfuscate_email(email))
         return mailbox
 
-    def create_contact(self, alias_id: int, email: str) -> Optional[Dict]:
+    async def create_contact(self, alias_id: int, email: str) -> Optional[Dict]:
         """Create or retrieve contact for alias, returns contact with reverse alias."""
+        # Contact creation is idempotent upstream, so the reverse alias can
+        # be cached per (alias, recipient) and repeat sends skip the call.
+        cache_key = (self.api_key, alias_id, email.lower())
+        cached = _cache_get(_contact_cache, cache_key, _CONTACT_TTL)
+        if cached is not None:
+            return cached
+
         url = f"{self.api_base_url}/aliases/{alias_id}/contacts"
         data = {"contact": f"<{email}>"}
-        response = self._make_request(
-            "POST", url, json=data, headers=self._get_headers()
-        )
+        response = await self._make_request("POST", url, json=data)
         if response:
             action = "retrieved" if response["existed"] else "created"
             logger.info("Contact %s: %s", action, obfuscate_email(response["contact"]))
+            if response.get("reverse_alias"):
+                _cache_put(
+                    _contact_cache, cache_key, response, _CONTACT_CACHE_MAXSIZE
+                )
         return response
 
-    def send_via_alias(
+    async def send_via_alias(
         self,
         mailbox: str,
         from_email: str,
@@ -215,74 +386,181 @@ class SimpleLoginClient:
             template: Template name (if not using body)
             substitutions: Variables for template/subject rendering
         """
-        try:
-            if substitutions is None:
-                substitutions = {}
-
-            if not self.api_key:
-                return False, "SimpleLogin API key not configured"
+        if substitutions is None:
+            substitutions = {}
 
-            if not self.smtp_manager:
-                return False, "SMTP manager not configured"
+        if not self.api_key:
+            return False, "SimpleLogin API key not configured"
 
-            if not self.smtp_manager.has_config(mailbox):
-                return (
-                    False,
-                    f"No SMTP configuration found for mailbox {obfuscate_email(mailbox)}",
-                )
-
-            if "@" not in from_email:
-                return False, "Invalid from_email format"
+        if not self.smtp_manager:
+            return False, "SMTP manager not configured"
 
-            alias_prefix, alias_domain = from_email.split("@", 1)
+        if not self.smtp_manager.has_config(mailbox):
+            return (
+                False,
+                f"No SMTP configuration found for mailbox {obfuscate_email(mailbox)}",
+            )
 
-            rendered_subject = self.smtp_manager.render_text(subject, substitutions)
+        if "@" not in from_email:
+            return False, "Invalid from_email format"
 
-            if template:
-                rendered_body = self.smtp_manager.load_and_render_template(
-                    template, substitutions
-                )
-                if not rendered_body:
-                    return False, f"Failed to load or render template: {template}"
-            elif body:
-                rendered_body = self.smtp_manager.render_text(body, substitutions)
-            else:
-                return False, "Either 'template' or 'body' must be provided"
-
-            alias_email = self.get_or_create_alias(alias_prefix, alias_domain, mailbox)
-            if not alias_email:
-                return False, "Failed to create or get alias"
-
-            contact = self.add_contact_to_alias(alias_email, to_email)
-            if not contact:
-                return False, "Failed to add recipient as contact"
-
-            reverse_alias = contact.get("reverse_alias")
-            if not reverse_alias:
-                return False, "No reverse alias found for contact"
+        alias_prefix, alias_domain = from_email.split("@", 1)
 
-            project_name = substitutions.get("project_name", "")
-            sender_name = f"{project_name} Team" if project_name else None
+        rendered_subject = self.smtp_manager.render_text(subject, substitutions)
 
-            self.smtp_manager.send_email(
-                mailbox,
-                reverse_alias,
-                rendered_subject,
-                rendered_body,
-                sender_name,
+        if template:
+            rendered_body = self.smtp_manager.load_and_render_template(
+                template, substitutions
             )
+            if not rendered_body:
+                return False, f"Failed to load or render template: {template}"
+        elif body:
+            rendered_body = self.smtp_manager.render_text(body, substitutions)
+        else:
+            return False, "Either 'template' or 'body' must be provided"
+
+        alias = await self.get_or_create_alias(alias_prefix, alias_domain, mailbox)
+        if not alias:
+            return False, "Failed to create or get alias"
+        alias_email = alias["email"]
 
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        contact = await self.create_contact(alias["id"], to_email)
+        if not contact:
+            return False, "Failed to add recipient as contact"
+
+        reverse_alias = contact.get("reverse_alias")
+        if not reverse_alias:
+            return False, "No reverse alias found for contact"
+
+        project_name = substitutions.get("project_name", "")
+        sender_name = f"{project_name} Team" if project_name else None
+
+        # The caller doesn't need to block on the SMTP conversation;
+        # alias and contact creation above already determined the
+        # reverse alias. Queue the delivery and return immediately,
+        # logging any failure from the worker thread.
+        future = smtp_executor.submit(
+            self.smtp_manager.send_email,
+            mailbox,
+            reverse_alias,
+            rendered_subject,
+            rendered_body,
+            sender_name,
+        )
+        future.add_done_callback(partial(_log_send_result, mailbox, to_email))
+
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        # Guarded so the obfuscation calls are skipped entirely when
+        # INFO logging is disabled.
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
-                "Email sent via SimpleLogin from %s (mailbox: %s) to %s via %s at %s",
+                "Email queued via SimpleLogin from %s (mailbox: %s) to %s via %s at %s",
                 obfuscate_email(alias_email),
                 obfuscate_email(mailbox),
                 obfuscate_email(to_email),
                 obfuscate_email(reverse_alias),
                 timestamp,
             )
-            return True, f"Email sent successfully at {timestamp}"
+        return True, f"Email queued for delivery at {timestamp}"
+
+    async def send_many(
+        self,
+        mailbox: str,
+        from_email: str,
+        recipients: List[str],
+        subject: str,
+        body: Optional[str] = None,
+        template: Optional[str] = None,
+        substitutions: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[bool, str]]:
+        """Send the same email to many recipients through one alias.
+
+        The alias is resolved once, contacts are created concurrently, and
+        all messages reuse the mailbox's persistent SMTP connection.
+
+        Returns:
+            One (success, message) tuple per recipient, in input order.
+        """
+        if substitutions is None:
+            substitutions = {}
+
+        def _fail(message: str) -> List[Tuple[bool, str]]:
+            return [(False, message)] * len(recipients)
+
+        if not recipients:
+            return []
+
+        if not self.api_key:
+            return _fail("SimpleLogin API key not configured")
+
+        if not self.smtp_manager:
+            return _fail("SMTP manager not configured")
+
+        if not self.smtp_manager.has_config(mailbox):
+            return _fail(
+                f"No SMTP configuration found for mailbox {obfuscate_email(mailbox)}"
+            )
+
+        if "@" not in from_email:
+            return _fail("Invalid from_email format")
+
+        alias_prefix, alias_domain = from_email.split("@", 1)
+
+        rendered_subject = self.smtp_manager.render_text(subject, substitutions)
+
+        if template:
+            rendered_body = self.smtp_manager.load_and_render_template(
+                template, substitutions
+            )
+            if not rendered_body:
+                return _fail(f"Failed to load or render template: {template}")
+        elif body:
+            rendered_body = self.smtp_manager.render_text(body, substitutions)
+        else:
+            return _fail("Either 'template' or 'body' must be provided")
+
+        alias = await self.get_or_create_alias(alias_prefix, alias_domain, mailbox)
+        if not alias:
+            return _fail("Failed to create or get alias")
 
-        except (smtplib.SMTPException, ConnectionError) as e:
-            logger.exception("Failed to send email: %s", e)
-            return False, "Failed to send email. Please try again later."
+        contacts = await asyncio.gather(
+            *[self.create_contact(alias["id"], recipient) for recipient in recipients]
+        )
+
+        project_name = substitutions.get("project_name", "")
+        sender_name = f"{project_name} Team" if project_name else None
+
+        loop = asyncio.get_running_loop()
+        results: List[Tuple[bool, str]] = []
+        for recipient, contact in zip(recipients, contacts):
+            reverse_alias = contact.get("reverse_alias") if contact else None
+            if not reverse_alias:
+                results.append((False, "Failed to add recipient as contact"))
+                continue
+            try:
+                await loop.run_in_executor(
+                    smtp_executor,
+                    self.smtp_manager.send_email,
+                    mailbox,
+                    reverse_alias,
+                    rendered_subject,
+                    rendered_body,
+                    sender_name,
+                )
+                results.append((True, "Email sent successfully"))
+            except (smtplib.SMTPException, ConnectionError) as e:
+                logger.exception(
+                    "Failed to send email to %s: %s", obfuscate_email(recipient), e
+                )
+                results.append(
+                    (False, "Failed to send email. Please try again later.")
+                )
+
+        sent = sum(1 for success, _ in results if success)
+        logger.info(
+            "Batch send via %s: %d/%d emails sent",
+            obfuscate_email(alias["email"]),
+            sent,
+            len(recipients),
+        )
+        return results
@@ -1,20 +1,62 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import json
+import logging
+import os
+import re
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
 from typing import Dict, Optional, Set, Tuple, Any
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound, meta
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+    meta,
+    select_autoescape,
+)
 from logutils import get_logger
 from utils import get_env_var, obfuscate_email
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Dedicated executor for blocking smtplib work, so SMTP sends don't compete
+# with FastAPI's shared threadpool. Each worker thread keeps a warm SMTP
+# connection via the per-account connection cache.
+smtp_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="smtp")
+
+_VAR_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_HTML_PATTERN = re.compile(r"\s*<")
+
+
+class _SafeDict(dict):
+    """Render missing placeholders as empty strings, like Jinja's Undefined."""
+
+    def __missing__(self, key):
+        return ""
+
+
+@lru_cache(maxsize=256)
+def _compile_string_template(env: Environment, text: str) -> Template:
+    """Compile an inline template once per unique source string."""
+    return env.from_string(text)
+
 
 class SMTPConfig:
     """Configuration for an SMTP account."""
 
+    __slots__ = ("from_email", "host", "port", "username", "password", "enable_tls")
+
     def __init__(
         self,
         from_email: str,
@@ -32,6 +74,69 @@ class SMTPConfig:
         self.enable_tls = enable_tls
 
 
+class SMTPConnection:
+    """Persistent authenticated SMTP connection for a single account."""
+
+    def __init__(self, config: SMTPConfig):
+        self.config = config
+        self._server: Optional[smtplib.SMTP] = None
+        # Serializes sends on this account only, so different accounts can
+        # send in parallel.
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a new SMTP connection and authenticate."""
+        server = smtplib.SMTP(self.config.host, self.config.port)
+        if self.config.enable_tls:
+            server.starttls()
+        server.login(self.config.username, self.config.password)
+        self._server = server
+        logger.info(
+            "Opened SMTP connection for: %s", obfuscate_email(self.config.from_email)
+        )
+        return server
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Return the cached connection if still alive, else reconnect."""
+        if self._server is not None:
+            try:
+                status, _ = self._server.noop()
+                if status == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_locked()
+        return self._connect()
+
+    def send_message(
+        self, message: MIMEMultipart, from_addr: str, to_addrs: list
+    ) -> None:
+        """Send a message, reconnecting and retrying once if the server dropped us."""
+        with self._lock:
+            try:
+                self._get_server().send_message(
+                    message, from_addr=from_addr, to_addrs=to_addrs
+                )
+            except smtplib.SMTPServerDisconnected:
+                self._close_locked()
+                self._connect().send_message(
+                    message, from_addr=from_addr, to_addrs=to_addrs
+                )
+
+    def close(self) -> None:
+        """Close the cached connection if open."""
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
 class SMTPManager:
     """Manager for multiple SMTP configurations and email sending."""
 
@@ -41,18 +146,31 @@ class SMTPManager:
             "SMTP_CREDS_FILE", "smtp_creds.json"
         )
         self.smtp_accounts: Dict[str, SMTPConfig] = {}
+        self._connections: Dict[str, SMTPConnection] = {}
+        self._smtp_lock = threading.Lock()
         self.template_dir = get_env_var("EMAIL_TEMPLATE_DIR", "email_templates")
         self.jinja_env = Environment(
             loader=FileSystemLoader(self.template_dir),
-            autoescape=True,
+            autoescape=select_autoescape(
+                enabled_extensions=("html", "htm"), default_for_string=False
+            ),
+            auto_reload=False,
+            cache_size=400,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            bytecode_cache=FileSystemBytecodeCache(),
         )
+        self._template_cache: Dict[str, Tuple[Template, frozenset]] = {}
         self._load_credentials()
 
     def _load_credentials(self):
         """Load SMTP credentials from JSON file."""
         try:
-            with open(self.creds_file, "r") as f:
-                data = json.load(f)
+            with open(self.creds_file, "rb") as f:
+                if orjson is not None:
+                    data = orjson.loads(f.read())
+                else:
+                    data = json.load(f)
                 smtp_accounts = data.get("smtp_accounts", [])
 
                 for account in smtp_accounts:
@@ -99,24 +217,70 @@ class SMTPManager:
     def render_text(self, text: str, substitutions: Dict[str, Any]) -> str:
         """Render text with Jinja2 substitutions."""
         try:
-            template = self.jinja_env.from_string(text)
+            # No placeholders at all: return the text verbatim without
+            # touching Jinja, which matters for multi-KB plain bodies.
+            if "{" not in text:
+                return text
+
+            # Fast path: plain {{ var }} substitutions with no control flow
+            # or filters can be handled by str.format_map without compiling
+            # a Jinja template.
+            if "{%" not in text and "{#" not in text and "|" not in text:
+                remainder = _VAR_PATTERN.sub("", text)
+                if "{" not in remainder and "}" not in remainder:
+                    converted = _VAR_PATTERN.sub(r"{\1}", text)
+                    return converted.format_map(_SafeDict(substitutions))
+
+            template = _compile_string_template(self.jinja_env, text)
             return template.render(substitutions)
         except Exception as e:
             logger.warning("Error rendering text: %s", e)
             return text
 
+    def prewarm_templates(self) -> None:
+        """Compile every template in the template directory ahead of time."""
+        try:
+            template_names = os.listdir(self.template_dir)
+        except OSError as e:
+            logger.warning("Could not list template directory: %s", e)
+            return
+
+        for filename in template_names:
+            if not filename.endswith(".html"):
+                continue
+            template_name = filename[: -len(".html")]
+            try:
+                self._get_template_entry(template_name)
+            except Exception as e:
+                logger.warning(
+                    "Failed to prewarm template %s: %s", template_name, e
+                )
+        logger.info("Prewarmed %d email templates", len(self._template_cache))
+
+    def _get_template_entry(self, template_name: str) -> Tuple[Template, frozenset]:
+        """Get the compiled template and its variable set, caching both."""
+        entry = self._template_cache.get(template_name)
+        if entry is not None:
+            return entry
+
+        template = self.jinja_env.get_template(f"{template_name}.html")
+        source, _, _ = self.jinja_env.loader.get_source(
+            self.jinja_env, f"{template_name}.html"
+        )
+
+        ast = self.jinja_env.parse(source)
+        variables = frozenset(meta.find_undeclared_variables(ast))
+        entry = (template, variables)
+        self._template_cache[template_name] = entry
+        return entry
+
     def get_template_variables(self, template_name: str) -> Tuple[bool, Set[str]]:
         """Extract all variable names used in a Jinja2 template."""
         try:
-            template_path = f"{self.template_dir}/{template_name}.html"
-            with open(template_path, "r", encoding="utf-8") as f:
-                template_content = f.read()
-
-            ast = self.jinja_env.parse(template_content)
-            variables = meta.find_undeclared_variables(ast)
+            _, variables = self._get_template_entry(template_name)
             logger.debug("Found variables in template %s: %s", template_name, variables)
             return True, variables
-        except FileNotFoundError:
+        except (FileNotFoundError, TemplateNotFound):
             return False, set([f"Template {template_name} not found"])
         except Exception as e:
             logger.error(
@@ -139,10 +303,9 @@ class SMTPManager:
             logger.error(error_msg)
             return False, error_msg
 
-        provided_variables = set(substitutions.keys())
-        missing_variables = list(required_variables - provided_variables)
+        missing_variables = [v for v in required_variables if v not in substitutions]
         error_msg = ""
-        is_valid = len(missing_variables) == 0
+        is_valid = not missing_variables
 
         if not is_valid:
             logger.warning(
@@ -165,7 +328,7 @@ class SMTPManager:
     ) -> Optional[str]:
         """Load and render HTML email template with provided substitutions."""
         try:
-            template = self.jinja_env.get_template(f"{template_name}.html")
+            template, _ = self._get_template_entry(template_name)
             rendered_content = template.render(substitutions)
             logger.info("Template %s loaded and rendered successfully", template_name)
             return rendered_content
@@ -201,18 +364,27 @@ class SMTPManager:
         msg["To"] = to_email
         msg["Subject"] = subject
 
-        is_html = body.strip().startswith("<") and ">" in body
+        is_html = _HTML_PATTERN.match(body) is not None
         mime_type = "html" if is_html else "plain"
         msg.attach(MIMEText(body, mime_type))
 
-        with smtplib.SMTP(config.host, config.port) as server:
-            if config.enable_tls:
-                server.starttls()
-            server.login(config.username, config.password)
-            server.sendmail(from_email, [to_email], msg.as_string())
+        with self._smtp_lock:
+            connection = self._connections.get(from_email)
+            if connection is None:
+                connection = SMTPConnection(config)
+                self._connections[from_email] = connection
+        connection.send_message(msg, from_email, [to_email])
 
-        logger.info(
-            "Email sent via SMTP from %s to %s",
-            obfuscate_email(from_email),
-            obfuscate_email(to_email),
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Email sent via SMTP from %s to %s",
+                obfuscate_email(from_email),
+                obfuscate_email(to_email),
+            )
+
+    def close_all(self) -> None:
+        """Close all cached SMTP connections."""
+        with self._smtp_lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
@@ -1,12 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-only
 
 import os
+from functools import lru_cache
 from typing import Optional
 from logutils import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=4096)
 def obfuscate_email(email: str) -> str:
     """Obfuscate email addresses.
 
@@ -16,17 +18,24 @@ def obfuscate_email(email: str) -> str:
     Returns:
         str: Obfuscated email (e.g., "us***@example.com")
     """
-    if not email or "@" not in email:
+    if not email:
         return email
 
-    local, domain = email.split("@", 1)
+    local, sep, domain = email.partition("@")
+    if not sep:
+        return email
     if len(local) <= 2:
         return f"{local}***@{domain}"
     return f"{local[:2]}***@{domain}"
 
 
+@lru_cache(maxsize=None)
 def get_env_var(key: str, default_value: Optional[str] = None, strict: bool = False):
-    """Retrieves the value of a configuration from the environment variables."""
+    """Retrieves the value of a configuration from the environment variables.
+
+    Results are memoized; call reload_env() after changing the environment
+    at runtime.
+    """
     try:
         value = os.environ[key] if strict else os.getenv(key) or default_value
         if strict and (value is None or value.strip() == ""):
@@ -40,3 +49,8 @@ def get_env_var(key: str, default_value: Optional[str] = None, strict: bool = Fa
     except ValueError as error:
         logger.error("Configuration '%s' is empty: %s", key, error)
         raise
+
+
+def reload_env() -> None:
+    """Forget memoized environment lookups so they are re-read on next use."""
+    get_env_var.cache_clear()